@@ -5,28 +5,123 @@ Computes the average of top 125 salaries from the latest season.
 """
 from __future__ import annotations
 
+import heapq
 import re
 import sys
-from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
-from typing import List, Tuple, Dict
+from html import unescape
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import List, Tuple, Dict, Set
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+    HTML_PARSER = "lxml"
+except ImportError:
+    etree = None
+    lxml_html = None
+    HTML_PARSER = "html.parser"
 
 SALARY_DATA_ENDPOINT = "https://questionnaire-148920.appspot.com/swe/data.html"
 THRESHOLD_COUNT = 125
 
+# Only the salaries table is ever inspected, so skip building the rest of the DOM.
+SALARY_TABLE_STRAINER = SoupStrainer("table", id="salaries-table")
+
+# Compiled once so the fallback path never reparses the CSS selector.
+_ROW_SELECTOR = soupsieve.compile("tbody tr")
+
+# Precompiled XPath expressions: one C-level pass pulls every cell out of a
+# row without per-cell soupsieve dispatch.
+if etree is not None:
+    _X_ROWS = etree.XPath('//table[@id="salaries-table"]/tbody/tr')
+    _X_NAME = etree.XPath('string(.//*[contains(@class, "player-name")])')
+    _X_AMOUNT = etree.XPath('string(.//*[contains(@class, "player-salary")])')
+    _X_SEASON = etree.XPath('string(.//*[contains(@class, "player-year")])')
+    _X_LEAGUE = etree.XPath('string(.//*[contains(@class, "player-level")])')
+
+_AMOUNT_RE = re.compile(r"[^\d.]")
+_YEAR_RE = re.compile(r"[^\d]")
+
+# Characters stripped by the fast-path amount parser; translate with a
+# precomputed table is the cheapest character filter CPython offers.
+_DROP_CHARS = str.maketrans("", "", "$, \t\r\n")
+
+# C-implemented sort key, bound once rather than rebuilt per call.
+_AMOUNT_KEY = attrgetter('amount')
 
-@dataclass
+# Sanity cap on parsed salaries: $100M, in cents.
+_MAX_SALARY_CENTS = 100_000_000 * 100
+
+if njit is not None and np is not None:
+    # LLVM-compiled reduction over the selected cent amounts; cache=True
+    # stores the compile artifact so the first-run cost is paid once.
+    @njit(cache=True)
+    def _sum_cents(amounts):
+        total = 0
+        for i in range(amounts.size):
+            total += amounts[i]
+        return total
+else:
+    _sum_cents = None
+
+# The feed's table has a fixed, flat schema (one text node per cell), so a
+# compiled regex can tokenize rows in one C-level scan with no DOM at all.
+# The DOM extractors below stay as the safety net if the markup ever drifts.
+_TABLE_RE = re.compile(
+    r'<table[^>]*id="salaries-table"[^>]*>(.*?)</table>',
+    re.IGNORECASE | re.DOTALL,
+)
+_TBODY_RE = re.compile(r"<tbody[^>]*>(.*?)</tbody>", re.IGNORECASE | re.DOTALL)
+_TR_RE = re.compile(r"<tr[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_CELL_RE = re.compile(
+    r'<td[^>]*class="[^"]*player-(name|salary|year|level)[^"]*"[^>]*>([^<]*)</td>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Shared session so repeated fetches reuse the TCP/TLS connection and
+# transient failures get a few retries with backoff. With requests-cache
+# installed, reruns within an hour skip the network round trip entirely.
+if requests_cache is not None:
+    _SESSION = requests_cache.CachedSession("mlb_cache", expire_after=3600)
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+))
+
+
+@dataclass(slots=True, frozen=True)
 class PlayerSalaryRecord:
     player: str
-    amount: Decimal
+    amount: int  # salary in cents
     season: int
     league: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseMetrics:
     rows_total: int = 0
     rows_parsed: int = 0
@@ -35,16 +130,16 @@ class ParseMetrics:
     bad_seasons: int = 0
     missing_league: int = 0
     non_major_league: int = 0
-    seasons_detected: set = None
-    
-    def __post_init__(self):
-        if self.seasons_detected is None:
-            self.seasons_detected = set()
+    seasons_detected: Set[int] = field(default_factory=set)
 
 
 def fetch_html_content(endpoint: str = SALARY_DATA_ENDPOINT) -> str:
     try:
-        resp = requests.get(endpoint, timeout=15)
+        resp = _SESSION.get(
+            endpoint,
+            timeout=15,
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
         resp.raise_for_status()
     except requests.Timeout:
         sys.exit(f"Connection timed out fetching {endpoint}")
@@ -52,28 +147,51 @@ def fetch_html_content(endpoint: str = SALARY_DATA_ENDPOINT) -> str:
         sys.exit(f"Unable to reach {endpoint}. Check network.")
     except requests.RequestException as err:
         sys.exit(f"Request failed: {err}")
-    return resp.text
+    # Decode explicitly so requests never falls back to charset detection.
+    return resp.content.decode("utf-8", errors="replace")
 
 
-def extract_decimal_amount(raw_text: str) -> Decimal | None:
+def extract_amount_cents(raw_text: str) -> int | None:
     if not raw_text or not raw_text.strip():
         return None
-    
-    sanitized = re.sub(r"[^\d.]", "", raw_text)
-    
+
+    # Fast path: well-formed feed values look like "$1,234,567.89", so
+    # dropping the formatting characters leaves digits and at most one dot.
+    cleaned = raw_text.translate(_DROP_CHARS)
+    try:
+        if '.' in cleaned:
+            whole, _, frac = cleaned.partition('.')
+            if '.' in frac:
+                raise ValueError(cleaned)
+            cents = int(whole or 0) * 100 + int(frac[:2].ljust(2, '0'))
+        else:
+            cents = int(cleaned) * 100
+    except ValueError:
+        cents = _sanitize_amount_cents(raw_text)
+        if cents is None:
+            return None
+
+    if cents <= 0 or cents > _MAX_SALARY_CENTS:
+        return None
+    return cents
+
+
+def _sanitize_amount_cents(raw_text: str) -> int | None:
+    """Slow path for oddly formatted amounts: regex-strip every stray character."""
+    sanitized = _AMOUNT_RE.sub("", raw_text)
+
     if not sanitized:
         return None
-    
+
     if sanitized.count('.') > 1:
         fragments = sanitized.split('.')
         sanitized = fragments[0] + '.' + ''.join(fragments[1:])
-    
+
+    whole, _, frac = sanitized.partition('.')
+
     try:
-        val = Decimal(sanitized)
-        if val <= 0 or val > Decimal('100000000'):
-            return None
-        return val
-    except (InvalidOperation, ValueError):
+        return int(whole or 0) * 100 + int(frac[:2].ljust(2, '0'))
+    except ValueError:
         return None
 
 
@@ -81,7 +199,7 @@ def extract_season_year(raw_text: str) -> int | None:
     if not raw_text or not raw_text.strip():
         return None
     
-    digits = re.sub(r"[^\d]", "", raw_text)
+    digits = _YEAR_RE.sub("", raw_text)
     
     if not digits:
         return None
@@ -95,95 +213,188 @@ def extract_season_year(raw_text: str) -> int | None:
         return None
 
 
+def _extract_row_texts_regex(html_content: str) -> List[Tuple[str, str, str, str]]:
+    table_match = _TABLE_RE.search(html_content)
+    if table_match is None:
+        return []
+
+    tbody_match = _TBODY_RE.search(table_match.group(1))
+    body = tbody_match.group(1) if tbody_match else table_match.group(1)
+
+    rows = []
+    for row_match in _TR_RE.finditer(body):
+        fields = {"name": "", "salary": "", "year": "", "level": ""}
+        for key, text in _CELL_RE.findall(row_match.group(1)):
+            fields[key.lower()] = unescape(text) if "&" in text else text
+        rows.append((fields["name"], fields["salary"], fields["year"], fields["level"]))
+    return rows
+
+
+def _extract_row_texts_lxml(html_content: str) -> List[Tuple[str, str, str, str]]:
+    doc = lxml_html.fromstring(html_content)
+    return [
+        (_X_NAME(row), _X_AMOUNT(row), _X_SEASON(row), _X_LEAGUE(row))
+        for row in _X_ROWS(doc)
+    ]
+
+
+def _extract_row_texts_bs4(html_content: str) -> List[Tuple[str, str, str, str]]:
+    parser = BeautifulSoup(html_content, HTML_PARSER, parse_only=SALARY_TABLE_STRAINER)
+    rows = []
+    for row in _ROW_SELECTOR.select(parser):
+        # One walk over the row's cells instead of four separate find() scans;
+        # classes stay authoritative so column order does not matter.
+        cells = {}
+        for cell in row.find_all("td"):
+            for cls in cell.get("class", ()):
+                cells.setdefault(cls, cell)
+        name_elem = cells.get("player-name")
+        amount_elem = cells.get("player-salary")
+        season_elem = cells.get("player-year")
+        league_elem = cells.get("player-level")
+        # Cells hold a single text node, so .string avoids the descendant
+        # walk get_text() does; the shared loop strips whitespace anyway.
+        rows.append((
+            (name_elem.string or "") if name_elem else "",
+            (amount_elem.string or "") if amount_elem else "",
+            (season_elem.string or "") if season_elem else "",
+            (league_elem.string or "") if league_elem else "",
+        ))
+    return rows
+
+
 def extract_records_from_html(html_content: str) -> Tuple[List[PlayerSalaryRecord], ParseMetrics]:
-    parser = BeautifulSoup(html_content, "html.parser")
-    table_rows = parser.select("table#salaries-table tbody tr")
-    
+    row_texts = _extract_row_texts_regex(html_content)
+    if not row_texts:
+        # Unexpected markup: fall back to a real DOM parse.
+        if lxml_html is not None:
+            row_texts = _extract_row_texts_lxml(html_content)
+        else:
+            row_texts = _extract_row_texts_bs4(html_content)
+
     records: List[PlayerSalaryRecord] = []
-    metrics = ParseMetrics(rows_total=len(table_rows))
-    
-    for row in table_rows:
-        name_elem = row.select_one(".player-name")
-        amount_elem = row.select_one(".player-salary")
-        season_elem = row.select_one(".player-year")
-        league_elem = row.select_one(".player-level")
-        
-        player_name = name_elem.get_text(strip=True) if name_elem else ""
-        
-        raw_amount = amount_elem.get_text(strip=True) if amount_elem else ""
-        parsed_amount = extract_decimal_amount(raw_amount)
+
+    # Count with locals inside the loop; local loads/stores are much cheaper
+    # than attribute access in CPython. Written back into ParseMetrics once.
+    rows_parsed = rows_dropped = 0
+    bad_amounts = bad_seasons = 0
+    missing_league = non_major_league = 0
+    seasons_detected: Set[int] = set()
+
+    for raw_name, raw_amount, raw_season, raw_league in row_texts:
+        player_name = raw_name.strip()
+
+        parsed_amount = extract_amount_cents(raw_amount)
         if not parsed_amount:
-            metrics.bad_amounts += 1
-        
-        raw_season = season_elem.get_text(strip=True) if season_elem else ""
+            bad_amounts += 1
+
         parsed_season = extract_season_year(raw_season)
         if not parsed_season:
-            metrics.bad_seasons += 1
-        
-        league_code = league_elem.get_text(strip=True) if league_elem else ""
+            bad_seasons += 1
+
+        league_code = raw_league.strip().upper()
         if not league_code:
-            metrics.missing_league += 1
-        
+            missing_league += 1
+
         if parsed_season:
-            metrics.seasons_detected.add(parsed_season)
-        
+            seasons_detected.add(parsed_season)
+
         if not (parsed_amount and parsed_season and league_code):
-            metrics.rows_dropped += 1
+            rows_dropped += 1
             continue
-        
-        if league_code.upper() != "MLB":
-            metrics.non_major_league += 1
-        
+
+        if league_code != "MLB":
+            non_major_league += 1
+
         records.append(PlayerSalaryRecord(
             player=player_name,
             amount=parsed_amount,
             season=parsed_season,
             league=league_code
         ))
-        metrics.rows_parsed += 1
-    
+        rows_parsed += 1
+
+    metrics = ParseMetrics(
+        rows_total=len(row_texts),
+        rows_parsed=rows_parsed,
+        rows_dropped=rows_dropped,
+        bad_amounts=bad_amounts,
+        bad_seasons=bad_seasons,
+        missing_league=missing_league,
+        non_major_league=non_major_league,
+        seasons_detected=seasons_detected,
+    )
     return records, metrics
 
 
 def compute_offer_value(
     records: List[PlayerSalaryRecord], 
     threshold: int = THRESHOLD_COUNT
-) -> Tuple[Decimal, List[PlayerSalaryRecord], int, Dict[str, int]]:
+) -> Tuple[int, List[PlayerSalaryRecord], int, Dict[str, int]]:
     
-    mlb_only = [r for r in records if r.league.upper() == "MLB"]
-    if not mlb_only:
+    # Bucket MLB records by season and track the latest season in one pass.
+    by_season: Dict[int, List[PlayerSalaryRecord]] = {}
+    mlb_total = 0
+    most_recent = 0
+    for r in records:
+        if r.league != "MLB":
+            continue
+        mlb_total += 1
+        by_season.setdefault(r.season, []).append(r)
+        if r.season > most_recent:
+            most_recent = r.season
+
+    if not mlb_total:
         raise ValueError("No MLB records found")
-    
-    most_recent = max(r.season for r in mlb_only)
-    
-    current_season = [r for r in mlb_only if r.season == most_recent]
-    
-    if not current_season:
-        raise ValueError(f"No MLB records for season {most_recent}")
-    
-    ranked = sorted(current_season, key=lambda r: r.amount, reverse=True)[:threshold]
-    
+
+    current_season = by_season[most_recent]
+
+    if np is not None:
+        # argpartition selects the top k in O(n); only those k indices are
+        # then sorted so the ranked list comes out in descending order.
+        amounts = np.fromiter(
+            (r.amount for r in current_season),
+            dtype=np.int64,
+            count=len(current_season),
+        )
+        k = min(threshold, amounts.size)
+        if k < amounts.size:
+            top_idx = np.argpartition(-amounts, k - 1)[:k]
+        else:
+            top_idx = np.arange(k)
+        top_idx = top_idx[np.argsort(-amounts[top_idx])]
+        ranked = [current_season[i] for i in top_idx]
+        top_amounts = amounts[top_idx]
+        if _sum_cents is not None:
+            aggregate = int(_sum_cents(top_amounts))
+        else:
+            aggregate = int(top_amounts.sum())
+    else:
+        # nlargest keeps a bounded heap (O(n log k)) and returns descending
+        # order, so the floor/ceiling fall out of the ends of the result.
+        ranked = heapq.nlargest(threshold, current_season, key=_AMOUNT_KEY)
+        aggregate = sum(r.amount for r in ranked)
+
     if not ranked:
         raise ValueError("Cannot compute offer - no valid records")
-    
-    aggregate = sum(r.amount for r in ranked)
-    final_offer = (aggregate / Decimal(len(ranked))).quantize(Decimal("0.01"))
-    
+    quotient, remainder = divmod(aggregate, len(ranked))
+    final_offer = quotient + (1 if remainder * 2 >= len(ranked) else 0)
+
     analysis = {
-        'mlb_total': len(mlb_only),
+        'mlb_total': mlb_total,
         'season_total': len(current_season),
         'used_count': len(ranked),
         'threshold': threshold,
-        'floor_amount': min(r.amount for r in ranked),
-        'ceiling_amount': max(r.amount for r in ranked),
+        'floor_amount': ranked[-1].amount,
+        'ceiling_amount': ranked[0].amount,
     }
     
     return final_offer, ranked, most_recent, analysis
 
 
-def format_money(amt: Decimal) -> str:
-    normalized = amt.quantize(Decimal("0.01"))
-    return f"${normalized:,.2f}"
+def format_money(amt_cents: int) -> str:
+    dollars, cents = divmod(amt_cents, 100)
+    return f"${dollars:,}.{cents:02d}"
 
 
 def display_parse_metrics(metrics: ParseMetrics) -> None:
@@ -203,7 +414,7 @@ def display_parse_metrics(metrics: ParseMetrics) -> None:
 
 
 def display_results(
-    final_offer: Decimal, 
+    final_offer: int,
     ranked: List[PlayerSalaryRecord], 
     season: int,
     analysis: Dict[str, int]